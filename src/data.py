@@ -1,31 +1,127 @@
-import random
+import queue
+import threading
+
+import numpy as np
+
+from src.grad import get_dtype
+
+
+def _iter_batches(x, y, perm, batch_size):
+  """
+  Yields consecutive (batch_x, batch_y) slices of x and y in the order given by perm.
+  """
+  for index in range(0, len(perm), batch_size):
+    sl = perm[index: index + batch_size]
+    yield x[sl], y[sl]
+
+
+def _put(q, item, stop):
+  """
+  Puts item on the queue, giving up once stop is set. Returns True if the item was queued.
+  """
+  while not stop.is_set():
+    try:
+      q.put(item, timeout=0.05)
+      return True
+    except queue.Full:
+      pass
+  return False
+
+
+def _produce(batches, q, stop):
+  """
+  Background worker that fills the queue with batches, followed by a None sentinel.
+  An exception raised while preparing a batch is put on the queue instead, to be re-raised by __next__.
+  """
+  try:
+    for batch in batches:
+      if not _put(q, batch, stop):
+        return
+  except Exception as e:
+    _put(q, e, stop)
+    return
+  _put(q, None, stop)
 
 
 class DataLoader:
-  def __init__(self, x_data, y_data, batch_size=None, shuffle=False):
+  def __init__(self, x_data, y_data, batch_size=None, shuffle=False, prefetch=2):
     """
     Initializes a DataLoader object for iterating through batches of data.
     Args:
-      x_data: A list containing the features (independent variables).
-      y_data: A list containing the labels (dependent variables).
+      x_data: A list or array containing the features (independent variables).
+      y_data: A list or array containing the labels (dependent variables).
       batch_size: The number of samples to include in each batch (default: None, iterates over all data at once).
       shuffle: A boolean indicating whether to shuffle the data before each iteration (default: False).
+      prefetch: The number of batches prepared ahead by a background thread (default: 2, 0 disables the thread).
+    Raises:
+      AssertionError: If batch_size is not positive or x_data and y_data have different lengths.
     """
+    assert batch_size is None or batch_size > 0, 'batch_size must be a positive integer'
     self.batch_size = batch_size
-    self.x_data = x_data
-    self.y_data = y_data
+    self.x = np.ascontiguousarray(x_data, dtype=get_dtype())
+    self.y = np.ascontiguousarray(y_data)
+    assert len(self.x) == len(self.y), 'x_data and y_data must have the same length'
     self.shuffle = shuffle
-    self.data = list(zip(self.x_data, self.y_data))  # Combine data
-    self.index = 0
+    self.prefetch = prefetch
+    self.N = len(self.x)
+    self.perm = np.arange(self.N)  # Sample order, permuted in place when shuffling
+    self._batch_iter = None
+    self._started = False  # next() without iter() starts an iteration, like iter() would
+    self._queue = None
+    self._thread = None
+    self._stop = None
+
+  def _batches(self):
+    """
+    Returns a generator of consecutive (batch_x, batch_y) slices following the current sample order.
+    """
+    batch_size = max(self.N, 1) if self.batch_size is None else self.batch_size
+    return _iter_batches(self.x, self.y, self.perm, batch_size)
+
+  def _shutdown(self):
+    """
+    Stops the prefetch thread of the current iteration, if any.
+    """
+    if self._thread is None:
+      return
+    self._stop.set()
+    self._thread.join()
+    self._thread = None
+    self._queue = None
+
+  def close(self):
+    """
+    Stops prefetching for an iteration that is abandoned early.
+    Called automatically when the DataLoader is garbage collected.
+    """
+    self._shutdown()
+
+  def __del__(self):
+    """
+    Stops the prefetch thread when the DataLoader goes away (__init__ may have failed before it was set).
+    """
+    if getattr(self, '_thread', None) is not None:
+      self.close()
 
   def __iter__(self):
     """
     Returns an iterator over batches of data.
     If shuffle is enabled, shuffles the data before iterating.
     """
+    self._shutdown()
+    self._started = True
     if self.shuffle:
-      random.shuffle(self.data)
-      
+      np.random.shuffle(self.perm)
+
+    if self.prefetch:
+      self._queue = queue.Queue(maxsize=self.prefetch)
+      self._stop = threading.Event()
+      # the worker gets no reference to self, so an abandoned loader can still be collected
+      self._thread = threading.Thread(target=_produce, args=(self._batches(), self._queue, self._stop), daemon=True)
+      self._thread.start()
+    else:
+      self._batch_iter = self._batches()
+
     return self
 
   def __next__(self):
@@ -33,17 +129,23 @@ class DataLoader:
     Returns the next batch of data.
     Raises:
       StopIteration: If there are no more batches left.
+      Exception: Any error raised by the background thread while preparing the batch.
     """
-    if self.index >= len(self.data):
-      raise StopIteration
+    if not self._started:
+      self.__iter__()
 
-    if self.batch_size is None:
-      return zip(*self.data)
+    if not self.prefetch:
+      return next(self._batch_iter)
 
-    batch_data = self.data[self.index: self.index + self.batch_size]
-    batch_x, batch_y = zip(*batch_data)
+    if self._queue is None:
+      raise StopIteration
 
-    # Update index for next iteration
-    self.index += self.batch_size
+    item = self._queue.get()
+    if item is None or isinstance(item, Exception):
+      self._thread = None
+      self._queue = None
+      if item is not None:
+        raise item
+      raise StopIteration
 
-    return batch_x, batch_y
+    return item
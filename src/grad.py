@@ -1,26 +1,73 @@
 import math
 
+import numpy as np
+
+
+DTYPE = np.float32  # floating point type of array-valued data (layer parameters, batches)
+
+
+def set_dtype(dtype):
+    """
+    Sets the floating point type used for newly created array data.
+    Args:
+        dtype: A NumPy floating point type, e.g. np.float32 (default) or np.float64 for debugging.
+    """
+    global DTYPE
+    assert np.issubdtype(dtype, np.floating), 'only floating point types are supported'
+    DTYPE = np.dtype(dtype).type
+
+
+def get_dtype():
+    """
+    Returns the floating point type used for newly created array data.
+    """
+    return DTYPE
+
+
+DEBUG_GRAPH = False  # when True, every Value records the op that created it (_op)
+
+
+def _no_backward():
+    """
+    Shared backward function for leaf nodes, which have nothing to propagate.
+    """
+
 
 class Value:
     """
     This class represents a computational node in a computational graph.
     It holds data, gradient, and performs automatic differentiation.
     """
+    __slots__ = ('data', 'grad', '_backward', '_prev', '_op', '_label')
+
     def __init__(self, data, _children=(), _op='', label=''):
         """
         Initializes a Value object.
         Args:
             data: The numerical data of the node.
             _children: A tuple of Value objects, the children of this node in the computation graph (internal use).
-            _op: The operation that created this node (internal use).
-            label: A label for the node (optional).
+            _op: The operation that created this node (internal use, only stored when DEBUG_GRAPH is set).
+            label: A label for the node (optional, stored only when given).
         """
         self.data = data
         self.grad = 0
-        self._backward = lambda: None
-        self._prev = set(_children)
-        self._op = _op
-        self.label = label
+        self._backward = _no_backward
+        self._prev = tuple(_children)
+        if DEBUG_GRAPH:
+            self._op = _op
+        if label:
+            self._label = label
+    
+    @property
+    def label(self):
+        """
+        Returns the label of the node, or an empty string if none was given.
+        """
+        return getattr(self, '_label', '')
+    
+    @label.setter
+    def label(self, label):
+        self._label = label
     
     def __repr__(self):
         """
@@ -74,7 +121,35 @@ class Value:
             A new Value object representing the result of the exponentiation.
         """
         assert isinstance(other, (int, float)), 'only supported for int/float'
-        out = Value(self.data**other, (self, ), f'**{other}')
+        d = self.data
+        
+        # common small integer exponents are plain multiplications/divisions, skipping pow
+        if other == 2:
+            out = Value(d * d, (self, ), '**2')
+            
+            def _backward():
+                self.grad += 2 * d * out.grad
+            out._backward = _backward
+            return out
+        
+        if other == 3:
+            out = Value(d * d * d, (self, ), '**3')
+            
+            def _backward():
+                self.grad += 3 * d * d * out.grad
+            out._backward = _backward
+            return out
+        
+        if other == -1:
+            inv = 1.0 / d
+            out = Value(inv, (self, ), '**-1')
+            
+            def _backward():
+                self.grad += -inv * inv * out.grad
+            out._backward = _backward
+            return out
+        
+        out = Value(d**other, (self, ), f'**{other}')
         
         def _backward():
             self.grad += other * self.data ** (other-1) * out.grad   
@@ -84,21 +159,52 @@ class Value:
     
     def __truediv__(self, other):
         """
-        Performs division using multiplication by the inverse (other**-1).
+        Performs division between two Value objects or a Value and a number.
+        Args:
+            other: The divisor (Value object or number).
+        Returns:
+            A new Value object representing the quotient.
         """
-        return self * other**-1
+        other = other if isinstance(other, Value) else Value(other)
+        inv = 1.0 / other.data
+        out = Value(self.data * inv, (self, other), '/')
+        
+        def _backward():
+            self.grad += inv * out.grad
+            other.grad -= self.data * inv * inv * out.grad
+        out._backward = _backward
+        
+        return out
     
     def __neg__(self):
         """
         Returns the negative of the Value object.
         """
-        return self * -1
+        out = Value(-self.data, (self, ), 'neg')
+        
+        def _backward():
+            self.grad -= out.grad
+        out._backward = _backward
+        
+        return out
     
     def __sub__(self, other):
         """
-        Performs subtraction using addition with the negative of the other operand.
+        Performs subtraction between two Value objects or a Value and a number.
+        Args:
+            other: The other operand (Value object or number).
+        Returns:
+            A new Value object representing the difference.
         """
-        return self + (-other)
+        other = other if isinstance(other, Value) else Value(other)
+        out = Value(self.data - other.data, (self, other), '-')
+        
+        def _backward():
+            self.grad += out.grad
+            other.grad -= out.grad
+        out._backward = _backward
+        
+        return out
     
     def exp(self):
         """
@@ -126,7 +232,7 @@ class Value:
         
         def _backward():
             self.grad += out.grad * (1 / x)
-        self._backward = _backward
+        out._backward = _backward
         
         return out
     
@@ -136,12 +242,11 @@ class Value:
         Returns:
             A new Value object representing the tanh.
         """
-        x = self.data
-        t = (math.exp(2*x)-1)/(math.exp(2*x)+1)
+        t = math.tanh(self.data)
         out = Value(t, (self, ), 'tanh')
         
         def _backward():
-            self.grad += (1 - t**2) * out.grad
+            self.grad += (1 - t*t) * out.grad
         out._backward = _backward
         
         return out
@@ -153,11 +258,69 @@ class Value:
             A new Value object representing the ReLU
         """
         x = self.data
-        t = x if x > 0 else 0
-        out = Value(t, (self, ), 'relu')
+        active = x > 0
+        out = Value(x if active else 0, (self, ), 'relu')
         
         def _backward():
-            self.grad += (out.data > 0) * out.grad
+            if not active:
+                return
+            self.grad += out.grad
+        out._backward = _backward
+        
+        return out
+
+    @classmethod
+    def dot(cls, ws, xs, bias):
+        """
+        Calculates the dot product of two sequences plus a bias as a single node.
+        Args:
+            ws: A sequence of Value objects (e.g. weights).
+            xs: A sequence of Value objects or numbers (e.g. inputs), same length as ws. Numbers receive no gradient.
+            bias: The bias term (Value object or number).
+        Raises:
+            AssertionError: If ws and xs have different lengths.
+        Returns:
+            A new Value object representing bias + sum(w * x).
+        """
+        ws = tuple(ws)
+        xs = tuple(xs)
+        assert len(ws) == len(xs), 'ws and xs must have the same length'
+        bias = bias if isinstance(bias, cls) else cls(bias)
+        ws_data = [w.data for w in ws]
+        xs_data = [x.data if isinstance(x, cls) else x for x in xs]
+        xs_values = tuple((i, x) for i, x in enumerate(xs) if isinstance(x, cls))  # only Value inputs get gradients
+        out = cls(bias.data + sum(w * x for w, x in zip(ws_data, xs_data)), ws + tuple(x for _, x in xs_values) + (bias, ), 'dot')
+        
+        def _backward():
+            g = out.grad
+            for i, w in enumerate(ws):
+                w.grad += xs_data[i] * g
+            for i, x in xs_values:
+                x.grad += ws_data[i] * g
+            bias.grad += g
+        out._backward = _backward
+        
+        return out
+
+    @classmethod
+    def sum(cls, vals):
+        """
+        Calculates the sum of a sequence of values as a single node.
+        Args:
+            vals: An iterable of Value objects or numbers.
+        Returns:
+            A new Value object representing the sum.
+        """
+        vals = tuple(v if isinstance(v, cls) else cls(v) for v in vals)
+        s = 0.0
+        for v in vals:
+            s += v.data
+        out = cls(s, vals, 'sum')
+        
+        def _backward():
+            g = out.grad
+            for v in vals:
+                v.grad += g
         out._backward = _backward
         
         return out
@@ -166,36 +329,46 @@ class Value:
         """
         Performs the backward pass to compute gradients of all nodes in the computational graph.
         """
+        # iterative post-order DFS, so deep graphs cannot hit the recursion limit
         topo = []
         visited = set()
-        
-        def build_topo(node):
-            if node not in visited:
+        stack = [(self, False)]
+        while stack:
+            node, expanded = stack[-1]
+            if not expanded:
+                if node in visited:
+                    stack.pop()
+                    continue
                 visited.add(node)
+                stack[-1] = (node, True)
                 for child in node._prev:
-                    build_topo(child)
+                    stack.append((child, False))
+            else:
+                if node._prev:
+                    node.grad = 0  # reset interior grads left over from a previous backward; leaf grads keep accumulating
                 topo.append(node)
-        build_topo(self)
+                stack.pop()
         
         self.grad = 1.0
         for node in reversed(topo):
+            g = node.grad
+            # nodes without incoming gradient have nothing to propagate (e.g. behind an inactive ReLU)
+            if g.__class__ is not np.ndarray and g == 0:
+                continue
             node._backward()
         
-    def __radd__(self, other):
-        """
-        Supports addition where the Value object is on the right side (e.g., 3 + x).
-        """
-        return self + other
-        
-    def __rmul__(self, other):
-        """
-        Supports multiplication where the Value object is on the right side (e.g., 2 * x).
-        """
-        return self * other
+    __radd__ = __add__  # addition with the Value on the right side (e.g., 3 + x)
+    
+    __rmul__ = __mul__  # multiplication with the Value on the right side (e.g., 2 * x)
     
     def __rsub__(self, other):
         """
-        Supports subtraction where the Value object is on the right side (e.g., x - 3).
+        Supports subtraction where the Value object is on the right side (e.g., 3 - x).
         """
-        return -self + other
-    
\ No newline at end of file
+        out = Value(other - self.data, (self, ), 'rsub')
+        
+        def _backward():
+            self.grad -= out.grad
+        out._backward = _backward
+        
+        return out
@@ -1,42 +1,102 @@
+import math
+
+import numpy as np
+
 from src.grad import Value
 
 
 def MSE_loss(ys, yp):
-    loss = sum((y_p - y_t)**2 for y_t, y_p in zip(ys, yp))
+    if isinstance(yp, Value):
+        # batched predictions held in one array-valued Value
+        diff = yp.data - np.asarray(ys, dtype=yp.data.dtype).reshape(yp.data.shape)
+        out = Value(float((diff * diff).sum()), (yp, ), 'mse')
+        
+        def _backward():
+            yp.grad += 2 * diff * out.grad
+        out._backward = _backward
+        
+        return out
+    
+    loss = Value.sum((y_p - y_t)**2 for y_t, y_p in zip(ys, yp))
                 
     return loss
 
 
 def hinge_loss(ys, yp):    
     total_loss = [(1 + -yi*scorei).relu() for yi, scorei in zip(ys, yp)]
-    loss = sum(total_loss) * (1.0/len(total_loss))
+    loss = Value.sum(total_loss) * (1.0/len(total_loss))
     
     return loss
 
 
 def softmax(yp):
+    if isinstance(yp, Value):
+        # logits held in one array-valued Value (last axis is the class axis)
+        E = np.exp(yp.data - yp.data.max(axis=-1, keepdims=True))
+        P = E / E.sum(axis=-1, keepdims=True)
+        out = Value(P, (yp, ), 'softmax')
+        
+        def _backward():
+            g = out.grad
+            yp.grad += P * (g - (g * P).sum(axis=-1, keepdims=True))
+        out._backward = _backward
+        
+        return out
+    
     exp_values = [val.exp() for val in yp]
-    exp_values_sum = sum(exp_values)
+    exp_values_sum = Value.sum(exp_values)
  
     return [val/exp_values_sum for val in exp_values]
 
 
-def encode(ys):
-    y_onehot = [0] * 10 # assuming 10 classes
-    y_onehot[ys] = 1
+def log_softmax_cross_entropy(z, target):
+    # fused -log(softmax(z)[target]) = logsumexp(z) - z[target], computed as a single node
+    vector = isinstance(z, Value)
+    logits = list(z.data) if vector else [v.data for v in z]
+    m = max(logits)
+    exps = [math.exp(l - m) for l in logits]
+    S = sum(exps)
+    lse = m + math.log(S)
+    out = Value(lse - logits[target], (z, ) if vector else tuple(z), 'ce')
     
-    return y_onehot
+    def _backward():
+        g = out.grad
+        probs = [e / S for e in exps]
+        probs[target] -= 1
+        if vector:
+            z.grad += np.asarray(probs, dtype=z.data.dtype) * g
+        else:
+            for v, p in zip(z, probs):
+                v.grad += p * g
+    out._backward = _backward
+    
+    return out
 
 
 def cross_entropy_loss(ys, yp):
-    y_pred = [softmax(y_p) for y_p in yp]
-    ys = [encode(y_s) for y_s in ys]
-
-    losses = []
-    for y_t, y_p in zip(ys, y_pred):
-        losses.append(sum((-1 * y_t[i] * y_p[i].log() for i in range(len(y_p)))))
+    if isinstance(yp, Value) and yp.data.ndim == 2:
+        # batched logits of shape (B, C) held in one array-valued Value
+        Z = yp.data
+        B = len(Z)
+        targets = np.asarray(ys, dtype=int)
+        m = Z.max(axis=1, keepdims=True)
+        E = np.exp(Z - m)
+        S = E.sum(axis=1, keepdims=True)
+        lse = m + np.log(S)  # logsumexp per row, so -log softmax never goes through log(0)
+        out = Value(float((lse[:, 0] - Z[np.arange(B), targets]).mean()), (yp, ), 'ce')
+        P = E / S
+        
+        def _backward():
+            dZ = P.copy()
+            dZ[np.arange(B), targets] -= 1
+            yp.grad += dZ * (out.grad / B)
+        out._backward = _backward
+        
+        return out
+    
+    losses = [log_softmax_cross_entropy(y_p, int(y_t)) for y_t, y_p in zip(ys, yp)]
     
-    return sum(losses) / len(losses)
+    return Value.sum(losses) / len(losses)
 
 
 # import torch.nn as nn
@@ -1,5 +1,8 @@
 import random
-from src.grad import Value
+
+import numpy as np
+
+from src.grad import Value, get_dtype
 
 
 class Module:
@@ -34,6 +37,7 @@ class Neuron(Module):
         """
         self.w = [Value(random.uniform(-1, 1)) for _ in range(n)]  # List of weights (Value objects)
         self.b = Value(random.uniform(-1, 1))  # Bias term (Value object)
+        self._params = self.w + [self.b]  # Cached parameter list, the structure never changes
 
     def __call__(self, x):
         """
@@ -43,7 +47,7 @@ class Neuron(Module):
         Returns:
             The output of the neuron after applying the tanh activation function (Value object).
         """
-        act = sum((wi * xi for wi, xi in zip(self.w, x)), self.b)  # Weighted sum of inputs and bias
+        act = Value.dot(self.w, x, self.b)  # Weighted sum of inputs and bias
         out = act.relu()  # Apply tanh activation
         return out
 
@@ -51,13 +55,14 @@ class Neuron(Module):
         """
         Returns a list containing the weights and bias of the neuron (Value objects).
         """
-        return self.w + [self.b]
+        return self._params
 
 
 class Layer(Module):
     """
-    This class represents a layer in a neural network.
-    It contains multiple neurons and performs the forward pass for the entire layer.
+    This class represents a fully connected layer in a neural network.
+    Weights and biases are stored as single array-valued Value objects and the
+    forward pass is computed with one matrix-vector product followed by ReLU.
     """
     def __init__(self, nin, nout):
         """
@@ -66,24 +71,64 @@ class Layer(Module):
             nin: The number of input features (dimensions of the input vector).
             nout: The number of output features (dimensions of the output vector).
         """
-        self.neurons = [Neuron(nin) for _ in range(nout)]  # List of Neuron objects
+        self.W = Value(np.random.uniform(-1, 1, (nout, nin)).astype(get_dtype()))  # Weight matrix of shape (nout, nin)
+        self.b = Value(np.random.uniform(-1, 1, nout).astype(get_dtype()))  # Bias vector of shape (nout,)
+        self._params = [self.W, self.b]  # Cached parameter list, the structure never changes
 
     def __call__(self, x):
         """
         Performs the forward pass for the layer.
         Args:
-            x: The input vector (Value object).
+            x: The input vector (a Value holding an array, a list of Value objects, a list of numbers or an np.ndarray),
+               or a batch of input vectors of shape (B, nin) as an np.ndarray, a nested list or a Value holding an array.
         Returns:
-            The output of the layer (a list of Value objects for multiple outputs, or a single Value object for single output).
-        """
-        outs = [n(x) for n in self.neurons]  # Get outputs from each neuron
-        return outs[0] if len(outs) == 1 else outs  # Return single output or list of outputs
+            The output of the layer (a Value holding an array for multiple outputs or a batch of shape (B, nout),
+            or a scalar Value for single output of a single input vector).
+        """
+        W, b = self.W, self.b
+        if isinstance(x, np.ndarray):
+            inputs = ()
+            x_arr = x.astype(W.data.dtype, copy=False)
+        elif isinstance(x, Value):
+            inputs = (x,)
+            x_arr = np.atleast_1d(x.data)
+        elif any(isinstance(xi, Value) for xi in x):
+            inputs = tuple(xi if isinstance(xi, Value) else Value(xi) for xi in x)
+            x_arr = np.array([xi.data for xi in inputs], dtype=W.data.dtype)
+        else:
+            inputs = ()
+            x_arr = np.asarray(x, dtype=W.data.dtype)
+
+        batched = x_arr.ndim == 2
+        z = x_arr @ W.data.T + b.data  # GEMM for a (B, nin) batch, GEMV for a single vector
+        active = z > 0
+        y = np.maximum(z, 0)  # ReLU, same activation as Neuron
+        out = Value(float(y[0]) if not batched and len(y) == 1 else y, (W, b) + inputs, 'layer')
+
+        def _backward():
+            dz = out.grad * active
+            if batched:
+                W.grad += dz.T @ x_arr
+                b.grad += dz.sum(0)
+            else:
+                W.grad += np.outer(dz, x_arr)
+                b.grad += dz
+            if inputs:
+                dx = dz @ W.data
+                if isinstance(x, Value):
+                    x.grad += dx
+                else:
+                    for xi, dxi in zip(inputs, dx):
+                        xi.grad += float(dxi)
+        out._backward = _backward
+
+        return out
 
     def parameters(self):
         """
-        Returns a list containing all parameters (Value objects) within the layer (from all neurons).
+        Returns a list containing the weight matrix and the bias vector of the layer (Value objects).
         """
-        return [params for n in self.neurons for params in n.parameters()]
+        return self._params
 
 
 class MLP(Module):
@@ -100,12 +145,13 @@ class MLP(Module):
         """
         sz = [nin] + nouts  # List of layer sizes (including input and output)
         self.layers = [Layer(sz[i], sz[i + 1]) for i in range(len(nouts))]  # List of Layer objects
+        self._params = [p for l in self.layers for p in l.parameters()]  # Cached parameter list, the structure never changes
 
     def __call__(self, x):
         """
         Performs the forward pass for the entire MLP.
         Args:
-            x: The input vector (Value object).
+            x: The input vector, or a batch of input vectors of shape (B, nin).
         Returns:
             The output of the MLP (Value object).
         """
@@ -115,25 +161,36 @@ class MLP(Module):
 
     def parameters(self):
         """
-        Returns a list containing all parameters (Value objects) within the MLP (from all layers and neurons).
+        Returns a list containing all parameters (Value objects) within the MLP (from all layers).
         """
-        return [params for l in self.layers for params in l.parameters()]
+        return self._params
     
     
 def L1_loss(model, alpha = 1e-4):
     """
     Calculates L1 regularization penalty
     """
-    reg_loss = alpha * sum((abs(p) for p in model.parameters()))
+    params = model.parameters()
+    out = Value(alpha * sum(float(np.abs(p.data).sum()) for p in params), tuple(params), 'l1')
     
-    return reg_loss
+    def _backward():
+        for p in params:
+            p.grad += alpha * np.sign(p.data) * out.grad
+    out._backward = _backward
+    
+    return out
     
     
 def L2_loss(model, alpha = 1e-4):
     """
     Calculates L2 regularization penalty
     """
-    reg_loss = alpha * sum((p*p for p in model.parameters()))
+    params = model.parameters()
+    out = Value(alpha * sum(float((p.data * p.data).sum()) for p in params), tuple(params), 'l2')
+    
+    def _backward():
+        for p in params:
+            p.grad += 2 * alpha * p.data * out.grad
+    out._backward = _backward
     
-    return reg_loss
-    
\ No newline at end of file
+    return out
@@ -0,0 +1,93 @@
+import gc
+import threading
+import time
+
+import numpy as np
+import pytest
+
+from src.data import DataLoader
+
+
+@pytest.mark.parametrize('prefetch', [0, 2])
+def test_batches_cover_dataset_each_epoch(prefetch):
+    X = np.arange(200).reshape(100, 2)
+    y = np.arange(100)
+    loader = DataLoader(X, y, batch_size=7, shuffle=True, prefetch=prefetch)
+    for _ in range(3):
+        batches = list(loader)
+        assert [len(b) for _, b in batches] == [7] * 14 + [2]
+        assert sorted(np.concatenate([b for _, b in batches])) == list(range(100))
+        for xb, yb in batches:
+            np.testing.assert_array_equal(xb[:, 0], 2 * yb)
+
+
+@pytest.mark.parametrize('prefetch', [0, 2])
+def test_no_batch_size_yields_whole_dataset(prefetch):
+    loader = DataLoader([[1, 2], [3, 4], [5, 6]], [0, 1, 2], prefetch=prefetch)
+    batches = list(loader)
+    assert len(batches) == 1
+    assert batches[0][0].dtype == np.float32
+
+
+@pytest.mark.parametrize('prefetch', [0, 2])
+def test_empty_dataset_yields_nothing(prefetch):
+    assert list(DataLoader([], [], prefetch=prefetch)) == []
+
+
+def test_abandoned_iteration_restarts():
+    loader = DataLoader(np.zeros((50, 1)), np.arange(50), batch_size=5)
+    for i, _ in enumerate(loader):
+        if i == 1:
+            break
+    assert len(list(loader)) == 10
+
+
+def test_invalid_arguments_are_rejected():
+    with pytest.raises(AssertionError):
+        DataLoader([[1], [2]], [1, 2], batch_size=0)
+    with pytest.raises(AssertionError):
+        DataLoader([[1], [2], [3]], [1, 2])
+
+
+def test_worker_error_is_raised_instead_of_hanging():
+    loader = DataLoader(np.zeros((4, 1)), np.arange(4), batch_size=2)
+    loader.perm = np.array([0, 1, 2, 9])  # out-of-range index makes the worker fail
+    it = iter(loader)
+    next(it)
+    with pytest.raises(IndexError):
+        next(it)
+    with pytest.raises(StopIteration):
+        next(it)
+
+
+@pytest.mark.parametrize('prefetch', [0, 2])
+def test_next_without_iter(prefetch):
+    loader = DataLoader(np.arange(6).reshape(3, 2), np.arange(3), batch_size=2, prefetch=prefetch)
+    assert len(next(loader)[1]) == 2
+    assert len(next(loader)[1]) == 1
+    with pytest.raises(StopIteration):
+        next(loader)
+    with pytest.raises(StopIteration):
+        next(loader)
+
+
+def test_abandoned_loaders_release_their_threads():
+    before = threading.active_count()
+    for _ in range(20):
+        for _ in DataLoader(np.zeros((100, 1)), np.arange(100), batch_size=1):
+            break
+    gc.collect()
+    deadline = time.time() + 5
+    while threading.active_count() > before and time.time() < deadline:
+        time.sleep(0.01)
+    assert threading.active_count() == before
+
+
+def test_close_stops_prefetching():
+    loader = DataLoader(np.zeros((100, 1)), np.arange(100), batch_size=1)
+    next(iter(loader))
+    thread = loader._thread
+    loader.close()
+    assert not thread.is_alive()
+    with pytest.raises(StopIteration):
+        next(loader)
@@ -0,0 +1,117 @@
+import math
+
+import pytest
+
+from src import grad
+from src.grad import Value
+
+
+def numerical_grad(f, xs, eps=1e-6):
+    grads = []
+    for i in range(len(xs)):
+        hi = list(xs); hi[i] += eps
+        lo = list(xs); lo[i] -= eps
+        grads.append((f(*hi) - f(*lo)) / (2 * eps))
+    return grads
+
+
+def check_grads(build, xs, tol=1e-5):
+    vals = [Value(x) for x in xs]
+    out = build(*vals)
+    out.backward()
+    expected = numerical_grad(lambda *a: build(*[Value(x) for x in a]).data, xs)
+    for v, g in zip(vals, expected):
+        assert v.grad == pytest.approx(g, abs=tol)
+
+
+def test_shared_value_accumulates_grad():
+    a = Value(3.0)
+    b = a * 2.0  # shared between the two downstream ops below
+    out = b * b + b.tanh()
+    out.backward()
+    t = math.tanh(6.0)
+    assert a.grad == pytest.approx(2 * (2 * 6.0 + (1 - t * t)))
+
+
+def test_same_value_used_twice_in_one_op():
+    a = Value(-4.0)
+    out = a * a
+    out.backward()
+    assert a.grad == pytest.approx(-8.0)
+
+
+def test_shared_subgraph_through_log():
+    a = Value(2.0)
+    b = a * 3
+    out = b.log() + b.log()
+    out.backward()
+    assert a.grad == pytest.approx(1.0)
+
+
+def test_repeated_backward_does_not_double_interior_grads():
+    a = Value(2.0)
+    c = a * -3.0 + a
+    d = c * c
+    d.backward()
+    first = a.grad
+    a.grad = 0
+    d.backward()
+    assert a.grad == pytest.approx(first)
+
+
+def test_arithmetic_grads():
+    check_grads(lambda a, b: (a - b) / (-a) + (3 - a) * (1 + b) - a / 2, [2.0, 5.0])
+    check_grads(lambda a, b: a**2 + b**3 + a**-1 + b**0.5, [1.7, 2.3])
+    check_grads(lambda a, b: (a * b).exp() + (a + b).log(), [0.3, 0.9])
+    check_grads(lambda a, b: (a * b).tanh() + (a - b).relu(), [0.8, -0.4])
+
+
+def test_dot_matches_elementwise_sum():
+    ws = [Value(2.0), Value(-1.0), Value(3.0)]
+    xs = [Value(1.0), 4.0, Value(0.5)]
+    out = Value.dot(ws, xs, 0.5)
+    out.backward()
+    assert out.data == pytest.approx(0.0)
+    assert [w.grad for w in ws] == pytest.approx([1.0, 4.0, 0.5])
+    assert (xs[0].grad, xs[2].grad) == pytest.approx((2.0, 3.0))
+
+
+def test_dot_rejects_length_mismatch():
+    with pytest.raises(AssertionError):
+        Value.dot([Value(1.0), Value(2.0)], [1.0], 0.0)
+
+
+def test_sum_passes_grad_to_every_term():
+    vals = [Value(float(i)) for i in range(5)]
+    out = Value.sum(v * v for v in vals)
+    out.backward()
+    assert out.data == pytest.approx(30.0)
+    assert [v.grad for v in vals] == pytest.approx([0.0, 2.0, 4.0, 6.0, 8.0])
+
+
+def test_backward_on_deep_graph():
+    x = Value(1.0)
+    y = x
+    for _ in range(20000):
+        y = y * 1.0 + 0.0
+    y.backward()
+    assert x.grad == pytest.approx(1.0)
+
+
+def test_label_is_kept_without_debug_graph():
+    assert Value(2.0, label='a').label == 'a'
+    assert Value(2.0).label == ''
+    v = Value(1.0)
+    v.label = 'b'
+    assert v.label == 'b'
+
+
+def test_debug_graph_records_ops(monkeypatch):
+    monkeypatch.setattr(grad, 'DEBUG_GRAPH', True)
+    a = Value(2.0, label='a')
+    out = a * 3.0 + a
+    assert out._op == '+'
+    assert out._prev[0]._op == '*'
+    assert a._op == '' and a.label == 'a'
+    out.backward()
+    assert a.grad == pytest.approx(4.0)
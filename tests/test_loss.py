@@ -0,0 +1,78 @@
+import math
+
+import numpy as np
+import pytest
+
+from src.grad import Value
+from src.loss import MSE_loss, cross_entropy_loss, softmax
+from src.nn import MLP
+
+
+def grads(model):
+    return [p.grad.copy() for p in model.parameters()]
+
+
+def test_cross_entropy_matches_reference():
+    y_p = [[Value(1.4), Value(0.4), Value(1.1), Value(0.1), Value(2.3)],
+           [Value(2), Value(0.2), Value(4), Value(0.1), Value(0.7)]]
+    loss = cross_entropy_loss([0, 1], y_p)
+    loss.backward()
+    expected = []
+    for z, t in zip([[1.4, 0.4, 1.1, 0.1, 2.3], [2, 0.2, 4, 0.1, 0.7]], [0, 1]):
+        expected.append(math.log(sum(math.exp(v) for v in z)) - z[t])
+    assert loss.data == pytest.approx(sum(expected) / 2)
+    S = sum(math.exp(v) for v in [1.4, 0.4, 1.1, 0.1, 2.3])
+    assert y_p[0][0].grad == pytest.approx((math.exp(1.4) / S - 1) / 2)
+
+
+@pytest.mark.parametrize('loss_fn, nout, make_y, scale', [
+    (MSE_loss, 1, lambda rng: rng.standard_normal(6), 1.0),
+    (cross_entropy_loss, 5, lambda rng: rng.integers(0, 5, 6), 1.0),
+    (cross_entropy_loss, 5, lambda rng: rng.integers(0, 5, 6), 200.0),  # large margins underflow softmax
+])
+def test_batched_loss_matches_per_sample(loss_fn, nout, make_y, scale):
+    rng = np.random.default_rng(0)
+    np.random.seed(0)
+    model = MLP(3, [4, nout])
+    X = scale * rng.standard_normal((6, 3))
+    y = make_y(rng)
+
+    batched = loss_fn(y, model(X))
+    model.zero_grad()
+    batched.backward()
+    batched_grads = grads(model)
+
+    per_sample = loss_fn(y, [model(x) for x in X])
+    model.zero_grad()
+    per_sample.backward()
+
+    assert np.isfinite(batched.data)
+    assert batched.data == pytest.approx(float(per_sample.data), rel=1e-5)
+    for a, b in zip(batched_grads, grads(model)):
+        np.testing.assert_allclose(a, b, rtol=1e-5, atol=1e-5 * scale)
+
+
+def test_batched_cross_entropy_large_margin_logits():
+    logits = np.array([[0, 120], [1, 2]], dtype=np.float32)
+    batched = cross_entropy_loss([0, 0], Value(logits))
+    per_sample = cross_entropy_loss([0, 0], [Value(row) for row in logits])
+    assert batched.data == pytest.approx(float(per_sample.data), rel=1e-5)
+    assert batched.data == pytest.approx((120 + math.log(1 + math.exp(-120)) + math.log(1 + math.e)) / 2, rel=1e-5)
+
+
+def test_softmax_of_array_value():
+    z = np.array([1.0, 2.0, 0.5])
+    v = Value(z.copy())
+    p = softmax(v)
+    w = np.array([0.3, -1.0, 2.0])
+    loss = Value(float(p.data @ w), (p, ))
+    def _backward():
+        p.grad += w * loss.grad
+    loss._backward = _backward
+    loss.backward()
+
+    f = lambda z: np.exp(z) / np.exp(z).sum() @ w
+    eps = 1e-6
+    expected = [(f(z + eps * np.eye(3)[i]) - f(z - eps * np.eye(3)[i])) / (2 * eps) for i in range(3)]
+    assert p.data.sum() == pytest.approx(1.0)
+    np.testing.assert_allclose(v.grad, expected, atol=1e-6)
@@ -0,0 +1,65 @@
+import numpy as np
+import pytest
+
+from src.grad import Value
+from src.nn import Layer, MLP, Neuron
+
+
+def forward(layers, x):
+    for layer in layers:
+        x = np.maximum(layer.W.data.astype(np.float64) @ x + layer.b.data, 0)
+    return x
+
+
+def test_layer_grads_match_finite_differences():
+    np.random.seed(0)
+    model = MLP(3, [4, 2])
+    x = [Value(v) for v in [0.5, -1.0, 2.0]]
+    out = model(x)
+    weights = np.array([0.7, -1.3])
+    # reduce the array-valued output with a fixed weighting to get a scalar loss
+    loss = Value(float(out.data @ weights), (out, ))
+    def _backward():
+        out.grad += weights * loss.grad
+    loss._backward = _backward
+    loss.backward()
+
+    eps = 1e-3
+    x0 = np.array([0.5, -1.0, 2.0])
+    for j in range(3):
+        e = np.eye(3)[j] * eps
+        expected = (forward(model.layers, x0 + e) @ weights - forward(model.layers, x0 - e) @ weights) / (2 * eps)
+        assert x[j].grad == pytest.approx(expected, abs=1e-3)
+
+    W = model.layers[0].W
+    analytic = W.grad.copy()
+    for idx in np.ndindex(W.data.shape):
+        orig = W.data[idx]
+        W.data[idx] = orig + eps
+        hi = forward(model.layers, x0) @ weights
+        W.data[idx] = orig - eps
+        lo = forward(model.layers, x0) @ weights
+        W.data[idx] = orig
+        assert analytic[idx] == pytest.approx((hi - lo) / (2 * eps), abs=1e-3)
+
+
+def test_layer_batch_matches_per_sample():
+    np.random.seed(1)
+    layer = Layer(3, 4)
+    X = np.random.randn(5, 3)
+    batched = layer(X).data
+    for row, x in zip(batched, X):
+        assert row == pytest.approx(layer(x).data, abs=1e-6)
+
+
+def test_single_output_layer_returns_scalar():
+    model = MLP(3, [4, 1])
+    out = model([1.0, 2.0, 3.0])
+    assert isinstance(out.data, float)
+
+
+def test_parameters_are_cached():
+    model = MLP(2, [16, 16, 1])
+    assert model.parameters() is model.parameters()
+    assert len(model.parameters()) == 6
+    assert len(Neuron(3).parameters()) == 4